@@ -9,13 +9,12 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import aiohttp
 from homeassistant.const import Platform
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.loader import async_get_loaded_integration
 
-from custom_components.smart_tag.const import CONF_ACCESS_TOKEN, CONF_REFRESH_TOKEN
-
-from .api import SmartTagApiClient
+from .api import SmartTagApiClient, orjson_serialize
+from .const import CONF_ACCESS_TOKEN, CONF_REFRESH_TOKEN, CONF_ROUTES
 from .coordinator import SmartTagCoordinator
 from .data import SmartTagData
 
@@ -24,11 +23,14 @@ if TYPE_CHECKING:
 
     from .data import SmartTagEntry
 
-PLATFORMS: list[Platform] = [
-    Platform.SENSOR,
-    Platform.BINARY_SENSOR,
-    Platform.SWITCH,
-]
+
+def _enabled_platforms(entry: SmartTagEntry) -> list[Platform]:
+    """Return only the platforms this entry actually needs set up."""
+    platforms = [Platform.SENSOR, Platform.BINARY_SENSOR]
+    # the switch platform only exists for polled routes
+    if entry.data.get(CONF_ROUTES):
+        platforms.append(Platform.SWITCH)
+    return platforms
 
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
@@ -40,21 +42,46 @@ async def async_setup_entry(
     coordinator = SmartTagCoordinator(
         hass=hass,
     )
+    # the integration only ever talks to the single SMART Tag host, so it gets
+    # its own session with an async DNS resolver + cache instead of HA's
+    # shared one
+    connector = aiohttp.TCPConnector(
+        resolver=aiohttp.AsyncResolver(),
+        use_dns_cache=True,
+        ttl_dns_cache=300,
+        # a few keepalive connections to the one host are plenty
+        limit=10,
+        limit_per_host=4,
+        keepalive_timeout=75,
+        enable_cleanup_closed=True,
+    )
     client = SmartTagApiClient(
-        session=async_get_clientsession(hass),
+        session=aiohttp.ClientSession(
+            connector=connector, json_serialize=orjson_serialize
+        ),
         access_token=entry.data[CONF_ACCESS_TOKEN],
         refresh_token=entry.data[CONF_REFRESH_TOKEN],
+        owns_session=True,
     )
+    platforms = _enabled_platforms(entry)
     entry.runtime_data = SmartTagData(
         client=client,
         integration=async_get_loaded_integration(hass, entry.domain),
         coordinator=coordinator,
+        platforms=platforms,
     )
 
-    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
+        await coordinator.async_config_entry_first_refresh()
+
+        await hass.config_entries.async_forward_entry_setups(entry, platforms)
+    except Exception:
+        # HA retries failed setups indefinitely - close the session we own so
+        # each retry doesn't leak another connector
+        await client.close()
+        raise
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
@@ -65,7 +92,15 @@ async def async_unload_entry(
     entry: SmartTagEntry,
 ) -> bool:
     """Handle removal of an entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    # unload exactly the platforms setup forwarded - entry data may have
+    # changed since then
+    unloaded = await hass.config_entries.async_unload_platforms(
+        entry, entry.runtime_data.platforms
+    )
+    if unloaded:
+        # close the session/connector we created in async_setup_entry
+        await entry.runtime_data.client.close()
+    return unloaded
 
 
 async def async_reload_entry(
@@ -73,5 +108,5 @@ async def async_reload_entry(
     entry: SmartTagEntry,
 ) -> None:
     """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    # let HA unload + set up atomically so runtime_data is torn down properly
+    await hass.config_entries.async_reload(entry.entry_id)
@@ -2,18 +2,26 @@
 
 from __future__ import annotations
 
+import asyncio
 import socket
 from urllib.parse import unquote
 
 import aiohttp
 import async_timeout
+import orjson
 from yarl import URL
 
-from custom_components.smart_tag.data import Ride, Student
+from .const import LOGGER
+from .data import Ride, Student
 
 API_ORIGIN = URL("https://api-parentapp-prod.azurewebsites.net/")
 
 
+def orjson_serialize(data: dict) -> str:
+    """Serialize a request body with orjson (aiohttp wants a str)."""
+    return orjson.dumps(data).decode()
+
+
 class SmartTagApiError(Exception):
     """Exception to indicate a general API error."""
 
@@ -26,9 +34,11 @@ class SmartTagApiAuthError(SmartTagApiError):
     """Exception to indicate an authentication error."""
 
 
-def _raise_response_error(response: aiohttp.ClientResponse) -> None:
+async def _raise_response_error(response: aiohttp.ClientResponse) -> None:
     """Raise an error based on the response code."""
     if response.status in (401, 403):
+        # hand the connection back to the pool - nobody will read this body
+        await response.release()
         raise SmartTagApiAuthError("invalid or expired credentials")
     # handle 400/404 manually
     if response.status not in (400, 404):
@@ -47,25 +57,61 @@ class SmartTagApiClient:
         access_token: str | None = None,
         refresh_token: str | None = None,
         api_origin: URL = API_ORIGIN,
+        *,
+        owns_session: bool = False,
     ) -> None:
         """Initialize the API client"""
         self._api_origin = api_origin
         self.refresh_token = refresh_token
         self.access_token = access_token
         self._session = session
+        self._owns_session = owns_session
+        # conditional-GET state for get_rides, keyed by student id
+        self._rides_etag: dict[str, str] = {}
+        self._rides_cache: dict[str, list[Ride]] = {}
+        # previously-built Students, reused while the roster is unchanged
+        self._student_cache: dict[int, Student] = {}
+        # concurrent 401s should only trigger one token refresh
+        self._refresh_lock = asyncio.Lock()
+        self._token_version = 0
+        # lazily-built Authorization header, invalidated on token change
+        self._cached_headers: dict | None = None
+        # parsed/normalized URLs for the handful of endpoints we hit
+        self._url_cache: dict[str, URL] = {}
+
+    @property
+    def _auth_headers(self) -> dict | None:
+        """The Authorization header, rebuilt lazily when the token changes."""
+        if self._cached_headers is None and self.access_token is not None:
+            self._cached_headers = {"Authorization": f"Bearer {self.access_token}"}
+        return self._cached_headers
+
+    def _request_headers(self, extra: dict | None) -> dict | None:
+        """Combine any extra headers with the cached Authorization header."""
+        auth = self._auth_headers
+        if extra and auth:
+            return {**extra, **auth}
+        return auth or extra
+
+    async def close(self) -> None:
+        """Close the session (and its connector) if this client owns it."""
+        if self._owns_session:
+            await self._session.close()
 
     async def login(self, email: str, password: str):
         """Login to the API and get a token"""
         self.refresh_token = None
         self.access_token = None
+        self._cached_headers = None
 
         response = await self._api_wrapper(
             "POST", "user/login", {"username": email, "password": password}
         )
         if response.status == 400:
             # invalid auth credentials
+            await response.release()
             raise SmartTagApiAuthError("invalid email or password")
-        json = await response.json()
+        json = orjson.loads(await response.read())
 
         # refresh token in cookie
         refresh_token = response.cookies.get("refreshToken")
@@ -73,26 +119,40 @@ class SmartTagApiClient:
             self.refresh_token = unquote(refresh_token.value)
 
         self.access_token = json["token"]
+        self._cached_headers = None
 
-    async def refresh_access_token(self):
-        """Refresh the access token"""
-        if self.access_token is None or self.refresh_token is None:
-            raise SmartTagApiAuthError("not authenticated")
+    async def refresh_access_token(self, if_version: int | None = None):
+        """
+        Refresh the access token.
 
-        data = {"token": self.access_token, "refreshToken": self.refresh_token}
-        response = await self._api_wrapper("POST", "user/refresh", data=data)
+        If `if_version` is given, the refresh is skipped when another caller
+        already refreshed the token since that version was read.
+        """
+        async with self._refresh_lock:
+            if if_version is not None and self._token_version != if_version:
+                # a concurrent caller beat us to it - reuse their token
+                return
 
-        if not response.ok:
-            raise SmartTagApiAuthError("need reauthentication")
+            if self.access_token is None or self.refresh_token is None:
+                raise SmartTagApiAuthError("not authenticated")
 
-        json = await response.json()
+            data = {"token": self.access_token, "refreshToken": self.refresh_token}
+            response = await self._api_wrapper("POST", "user/refresh", data=data)
 
-        # refresh token in cookie
-        refresh_token = response.cookies.get("refreshToken")
-        if refresh_token:
-            self.refresh_token = unquote(refresh_token.value)
+            if not response.ok:
+                await response.release()
+                raise SmartTagApiAuthError("need reauthentication")
 
-        self.access_token = json["token"]
+            json = orjson.loads(await response.read())
+
+            # refresh token in cookie
+            refresh_token = response.cookies.get("refreshToken")
+            if refresh_token:
+                self.refresh_token = unquote(refresh_token.value)
+
+            self.access_token = json["token"]
+            self._cached_headers = None
+            self._token_version += 1
 
     async def get_students(self):
         """Get a list of the user's students."""
@@ -101,20 +161,68 @@ class SmartTagApiClient:
 
         response = await self._authed_api_wrapper("GET", "parent/all-students")
 
-        return [Student.from_dict(d) for d in await response.json()]
-
-    async def get_rides(self, student_id: str, limit: int):
-        """Get the {limit} most recent rides for this student"""
+        json = orjson.loads(await response.read())
+        cache = self._student_cache
+        students = []
+        for d in json:
+            # the roster rarely changes - when the payload matches what we
+            # already built, keep handing out the cached instance so
+            # downstream consumers share identity across polls
+            student = Student.from_dict(d)
+            cached = cache.get(student.id)
+            if cached == student:
+                student = cached
+            else:
+                cache[student.id] = student
+            students.append(student)
+        LOGGER.debug("fetched %d students", len(students))
+        return students
+
+    async def get_rides_if_modified(self, student_id: str, limit: int):
+        """
+        Get the {limit} most recent rides for this student.
+
+        Returns None when the page hasn't changed since the last fetch (per
+        its ETag).
+        """
         if self.access_token is None:
             raise SmartTagApiAuthError("not authenticated")
 
         query = {"studentid": student_id, "pageIndex": 0, "pageSize": limit}
+        # send the validator from the last response so an unchanged page
+        # comes back as a bodyless 304
+        etag = self._rides_etag.get(student_id)
+        headers = {"If-None-Match": etag} if etag else None
         response = await self._authed_api_wrapper(
-            "GET", "student/riding-activity", query=query
+            "GET", "student/riding-activity", query=query, headers=headers
         )
-        json = await response.json()
+        if response.status == 304:
+            # nothing changed - no body, no parse
+            return None
+
+        json = orjson.loads(await response.read())
+        rides = Ride.from_list(json["data"])
+
+        etag = response.headers.get("ETag")
+        if etag:
+            self._rides_etag[student_id] = etag
+            self._rides_cache[student_id] = rides
 
-        return [Ride.from_dict(d) for d in json["data"]]
+        return rides
+
+    async def get_rides(self, student_id: str, limit: int):
+        """Get the {limit} most recent rides for this student"""
+        rides = await self.get_rides_if_modified(student_id, limit)
+        if rides is None:
+            # unchanged - reuse the previous parse
+            return self._rides_cache[student_id]
+        return rides
+
+    async def get_rides_bulk(self, student_ids: list[str], limit: int):
+        """Get the {limit} most recent rides for each student concurrently."""
+        return await asyncio.gather(
+            *(self.get_rides(student_id, limit) for student_id in student_ids)
+        )
 
     async def _api_wrapper(
         self,
@@ -125,26 +233,25 @@ class SmartTagApiClient:
         headers: dict | None = None,
     ):
         """Make a call to the SMART Tag API with error handling."""
+        # only join/normalize each endpoint path once
+        base = self._url_cache.get(path)
+        if base is None:
+            base = self._url_cache[path] = self._api_origin / path
+
         try:
             async with async_timeout.timeout(10):
                 response = await self._session.request(
                     method=method,
-                    url=self._api_origin / path % query,
+                    url=base % query if query else base,
                     headers=headers,
                     json=data,
                 )
-                _raise_response_error(response)
+                await _raise_response_error(response)
                 return response
 
-        except TimeoutError as exception:
-            err = f"Timeout error fetching information - {exception}"
-            raise SmartTagApiNetworkError(err) from exception
-        except (aiohttp.ClientError, socket.gaierror) as exception:
+        except (TimeoutError, aiohttp.ClientError, socket.gaierror) as exception:
             err = f"Error fetching information - {exception}"
             raise SmartTagApiNetworkError(err) from exception
-        except Exception as exception:  # pylint: disable=broad-except
-            err = f"Something really wrong happened! - {exception}"
-            raise SmartTagApiError(err) from exception
 
     async def _authed_api_wrapper(
         self,
@@ -152,26 +259,20 @@ class SmartTagApiClient:
         path: str,
         data: dict | None = None,
         query: dict | None = None,
+        headers: dict | None = None,
     ):
         """Make an authenticated call to the SMART Tag API with error handling"""
         # add bearer token
-        headers = (
-            {"Authorization": f"Bearer {self.access_token}"}
-            if self.access_token is not None
-            else None
-        )
+        req_headers = self._request_headers(headers)
+        pre_version = self._token_version
 
         try:
-            return await self._api_wrapper(method, path, data, query, headers)
+            return await self._api_wrapper(method, path, data, query, req_headers)
         except SmartTagApiAuthError:
-            # try to reauthenticate
-            await self.refresh_access_token()
+            # try to reauthenticate (no-op if a concurrent call already did)
+            await self.refresh_access_token(if_version=pre_version)
 
             # new bearer token
-            headers = (
-                {"Authorization": f"Bearer {self.access_token}"}
-                if self.access_token is not None
-                else None
-            )
+            req_headers = self._request_headers(headers)
 
-            return await self._api_wrapper(method, path, data, query, headers)
+            return await self._api_wrapper(method, path, data, query, req_headers)
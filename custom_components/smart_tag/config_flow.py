@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import time, timedelta
 from typing import TYPE_CHECKING
@@ -11,7 +12,7 @@ from homeassistant import config_entries, data_entry_flow
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
 from homeassistant.exceptions import InvalidStateError
 from homeassistant.helpers import selector
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import (
     SmartTagApiAuthError,
@@ -22,7 +23,12 @@ from .api import (
 from .const import CONF_ROUTES, CONF_STUDENT, DOMAIN, LOGGER
 
 if TYPE_CHECKING:
-    from custom_components.smart_tag.data import Ride
+    from .data import Ride, Student
+
+
+def _fmt_time(value: time) -> str:
+    """Format a time as 12-hour h:mm AM/PM (without strftime)."""
+    return f"{(value.hour % 12) or 12}:{value.minute:02d} {'AM' if value.hour < 12 else 'PM'}"
 
 
 @dataclass
@@ -44,11 +50,23 @@ class Route:
     id: int
     name: str
 
-    DISPLAY_TIME_FORMAT = "%I:%M %p"
+    def __post_init__(self) -> None:
+        """Build the display string once, instead of strftime-ing per render."""
+        self._display = (
+            f"**{self.name}** (Embark start: {_fmt_time(self.embark_start)} • "
+            f"Embark end: {_fmt_time(self.embark_end)} • "
+            f"Ride length: {self.length:.2f} min • "
+            f"Debark end: {_fmt_time(self.debark_end)})"
+        )
 
     def display(self):
         """Return a human-readable string representing this route."""
-        return f"**{self.name}** (Embark start: {self.embark_start.strftime(self.DISPLAY_TIME_FORMAT)} • Embark end: {self.embark_end.strftime(self.DISPLAY_TIME_FORMAT)} • Ride length: {self.length:.2f} min • Debark end: {self.debark_end.strftime(self.DISPLAY_TIME_FORMAT)})"
+        return self._display
+
+
+# padding applied to the observed embark/debark times
+EMBARK_PAD = timedelta(minutes=5)
+DEBARK_PAD = timedelta(minutes=10)
 
 
 def average_route_polling_data(data: list[Ride]):
@@ -56,25 +74,20 @@ def average_route_polling_data(data: list[Ride]):
     embark_start_min = time(23, 59, 59)
     embark_end_max = time(0, 0)
     debark_end_max = time(0, 0)
-    length_secs = 0
+    total_secs = 0.0
 
-    # Knuth 1998 - average
-    for i, ride in enumerate(data):
-        embark_start_min = min(embark_start_min, ride.start.time.time())
-        embark_end_max = max(
-            embark_end_max, (ride.start.time + timedelta(minutes=5)).time()
-        )
-        debark_end_max = max(
-            debark_end_max, (ride.end.time + timedelta(minutes=10)).time()
-        )
-        length_secs += ((ride.end.time - ride.start.time).seconds - length_secs) / (
-            i + 1
-        )
+    for ride in data:
+        start = ride.start.time
+        end = ride.end.time
+        embark_start_min = min(embark_start_min, start.time())
+        embark_end_max = max(embark_end_max, (start + EMBARK_PAD).time())
+        debark_end_max = max(debark_end_max, (end + DEBARK_PAD).time())
+        total_secs += (end - start).total_seconds()
 
     return Route(
         embark_start=embark_start_min,
         embark_end=embark_end_max,
-        length=length_secs / 60.0,
+        length=total_secs / len(data) / 60.0,
         debark_end=debark_end_max,
         id=data[0].route_id,
         name=data[0].route_name,
@@ -91,6 +104,10 @@ class SmartTagConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         super().__init__()
 
         self._api_client = None
+        # cache API responses for the duration of the flow so form
+        # redisplays (e.g. validation errors) don't re-fetch
+        self._students_cache: list[Student] | None = None
+        self._rides_cache: dict[str, list[Ride]] = {}
 
     async def async_step_user(
         self,
@@ -98,7 +115,9 @@ class SmartTagConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     ) -> data_entry_flow.FlowResult:
         """Handle a flow initialized by the user."""
         if self._api_client is None:
-            self._api_client = SmartTagApiClient(async_create_clientsession(self.hass))
+            # the flow only makes a handful of requests, so reuse the HA-wide
+            # session (and its warm connection pool) instead of creating one
+            self._api_client = SmartTagApiClient(async_get_clientsession(self.hass))
 
         _errors = {}
         if user_input is not None:
@@ -151,13 +170,17 @@ class SmartTagConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         _errors = {}
         if user_input is not None:
             self._student_id = str(user_input[CONF_STUDENT])
+            # done with the roster once a student is picked
+            self._students_cache = None
             return await self.async_step_choose_times()
 
-        students = []
+        students = self._students_cache or []
 
-        # load a list of students
+        # load a list of students (unless this is just a form redisplay)
         try:
-            students = await self._api_client.get_students()
+            if self._students_cache is None:
+                students = await self._api_client.get_students()
+                self._students_cache = students
         except SmartTagApiAuthError as exception:
             LOGGER.warning(exception)
             _errors["base"] = "auth"
@@ -201,10 +224,12 @@ class SmartTagConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             pass
 
-        # get the 50 most recent rides
-        rides = []
+        # get the 50 most recent rides (unless this is just a form redisplay)
+        rides = self._rides_cache.get(self._student_id, [])
         try:
-            rides = await self._api_client.get_rides(self._student_id, 50)
+            if self._student_id not in self._rides_cache:
+                rides = await self._api_client.get_rides(self._student_id, 50)
+                self._rides_cache[self._student_id] = rides
         except SmartTagApiAuthError as exception:
             LOGGER.warning(exception)
             _errors["base"] = "auth"
@@ -215,12 +240,10 @@ class SmartTagConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             LOGGER.exception(exception)
             _errors["base"] = "unknown"
 
-        routes: dict[int, list[Ride]] = {}
+        # group the rides by route
+        routes: defaultdict[int, list[Ride]] = defaultdict(list)
         for ride in rides:
-            if ride.route_id in routes:
-                routes[ride.route_id].append(ride)
-            else:
-                routes[ride.route_id] = [ride]
+            routes[ride.route_id].append(ride)
 
         # average all items together
         avg_routes = [average_route_polling_data(rides) for rides in routes.values()]
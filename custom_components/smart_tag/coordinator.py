@@ -1,24 +1,56 @@
-"""DataUpdateCoordinator for integration_blueprint."""
+"""DataUpdateCoordinator for smart_tag."""
 
 from __future__ import annotations
 
-from datetime import timedelta
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import (
     SmartTagApiAuthError,
     SmartTagApiError,
 )
-from .const import DOMAIN, LOGGER
+from .const import CONF_STUDENT, DOMAIN, LOGGER
+from .data import Ride
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
 
     from .data import SmartTagEntry
 
+# poll frequently around the morning/afternoon bus runs, lazily otherwise
+PEAK_HOURS = ((7, 9), (14, 16))
+PEAK_INTERVAL = timedelta(minutes=5)
+OFF_PEAK_INTERVAL = timedelta(hours=2)
+
+# how many recent rides to fetch per poll
+RIDE_PAGE_SIZE = 50
+
+STORAGE_VERSION = 1
+
+# hydrate from disk after a restart if the stored poll is newer than this
+STORE_MAX_AGE_SECS = 3600
+
+
+def _poll_interval(now: datetime) -> timedelta:
+    """Pick the polling interval for the current local time."""
+    if any(start <= now.hour < end for start, end in PEAK_HOURS):
+        return PEAK_INTERVAL
+
+    # off-peak: never sleep past the start of the next peak window, or a poll
+    # just before it would overshoot the whole bus run
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    until_next_peak = min(
+        midnight + timedelta(hours=start, days=0 if now.hour < start else 1) - now
+        for start, _end in PEAK_HOURS
+    )
+    return min(OFF_PEAK_INTERVAL, until_next_peak)
+
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
 class SmartTagCoordinator(DataUpdateCoordinator):
@@ -35,14 +67,52 @@ class SmartTagCoordinator(DataUpdateCoordinator):
             hass=hass,
             logger=LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(hours=1),
+            update_interval=_poll_interval(datetime.now().astimezone()),
         )
+        # persisted copy of the last parsed poll, created on first update
+        # (the config entry isn't attached yet at construction time)
+        self._store: Store | None = None
 
     async def _async_update_data(self) -> Any:
         """Update data via library."""
+        if self.data is not None and not self._listeners:
+            # nobody is listening (e.g. every entity disabled) - don't spend
+            # a network round-trip and a parse on data nothing will read
+            return self.data
+
+        entry = self.config_entry
+        if self._store is None:
+            self._store = Store(
+                self.hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"
+            )
+
+        if self.data is None:
+            # first update after a (re)start - hydrate the last poll from
+            # disk instead of stalling startup on a network round-trip
+            cached = await self._store.async_load()
+            if cached and time.time() - cached["ts"] < STORE_MAX_AGE_SECS:
+                # asdict wrote the fields in declaration order, so the values
+                # feed the constructor positionally - no kwargs dict per ride
+                return [Ride(*ride.values()) for ride in cached["rides"]]
+
+        # adapt the cadence to the time of day before the next poll is
+        # scheduled
+        self.update_interval = _poll_interval(datetime.now().astimezone())
+
         try:
-            pass
+            rides = await entry.runtime_data.client.get_rides_if_modified(
+                entry.data[CONF_STUDENT], RIDE_PAGE_SIZE
+            )
         except SmartTagApiAuthError as exception:
             raise ConfigEntryAuthFailed(exception) from exception
         except SmartTagApiError as exception:
             raise UpdateFailed(exception) from exception
+
+        if rides is None:
+            # a bodyless 304 - nothing new since the last poll
+            return self.data
+
+        await self._store.async_save(
+            {"rides": [asdict(ride) for ride in rides], "ts": time.time()}
+        )
+        return rides
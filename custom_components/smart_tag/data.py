@@ -1,13 +1,18 @@
-"""Custom types for integration_blueprint."""
+"""Custom types for smart_tag."""
 
 from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import TYPE_CHECKING
+from operator import itemgetter
+from sys import intern
+from typing import TYPE_CHECKING, ClassVar, NamedTuple
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from homeassistant.config_entries import ConfigEntry
+    from homeassistant.const import Platform
     from homeassistant.loader import Integration
 
     from .api import SmartTagApiClient
@@ -17,30 +22,59 @@ if TYPE_CHECKING:
 type SmartTagEntry = ConfigEntry[SmartTagData]
 
 
-@dataclass
+def _compile_from_dict(
+    cls: type,
+    field_exprs: tuple[str, ...],
+    env: dict | None = None,
+):
+    """
+    Generate a positional deserializer for `cls` at import time.
+
+    `field_exprs` are expressions over the payload dict `v`, one per dataclass
+    field, in field order. Compiling the call once collapses the per-record
+    kwargs boxing and attribute dispatch of a hand-written from_dict into a
+    single straight-line positional call.
+    """
+    body = f"def from_dict(v):\n    return _cls({', '.join(field_exprs)})"
+    namespace = {"_cls": cls, **(env or {})}
+    exec(body, namespace)  # noqa: S102
+    return namespace["from_dict"]
+
+
+@dataclass(slots=True)
 class SmartTagData:
-    """Data for the Blueprint integration."""
+    """Runtime data for a SMART Tag config entry."""
 
     client: SmartTagApiClient
     coordinator: SmartTagCoordinator
     integration: Integration
+    # the platforms actually forwarded at setup time, so unload matches even
+    # if entry data changed in between
+    platforms: list[Platform]
 
 
-@dataclass
+def _longitude(value: dict, key: str) -> float:
+    """
+    Read a longitude, tolerating the API's current `Longtitude` misspelling.
+
+    Falls back to the correctly-spelled key so an upstream spelling fix
+    doesn't turn into a KeyError (and an UpdateFailed retry storm) on every
+    ride.
+    """
+    long = value.get(f"{key}Longtitude")
+    if long is None:
+        return value[f"{key}Longitude"]
+    return long
+
+
+@dataclass(slots=True, frozen=True)
 class Student:
     """A student from the SMART Tag portal"""
 
-    @classmethod
-    def from_dict(cls, value: dict) -> Student:
-        """Convert a dict to a Student."""
-        return cls(
-            campus=value["campus"],
-            external_id=value["externalId"],
-            full_name=value["fullName"],
-            id=value["id"],
-            grade=value["grade"],
-        )
+    from_dict: ClassVar[Callable[[dict], Student]]
 
+    # NOTE: field order is load-bearing - the generated deserializer
+    # constructs Students positionally
     campus: str
     external_id: str
     full_name: str
@@ -48,8 +82,49 @@ class Student:
     grade: str
 
 
-@dataclass
-class RideEndpoint:
+# generated deserializer - payload keys listed in dataclass field order;
+# campus/grade repeat across students, so duplicates are interned away
+Student.from_dict = staticmethod(
+    _compile_from_dict(
+        Student,
+        (
+            "_intern(v['campus'])",
+            "v['externalId']",
+            "v['fullName']",
+            "v['id']",
+            "_intern(v['grade'])",
+        ),
+        {"_intern": intern},
+    )
+)
+
+
+# resolved once at import - astimezone() re-reads the system tz on every call
+_LOCAL_TZ = datetime.now().astimezone().tzinfo
+
+
+def _parse_ride_ts(value: str) -> int:
+    """
+    Parse a fixed-width API timestamp into epoch seconds.
+
+    The API emits local-time `MM/DD/YYYY HH:MM:SS` strings; slicing straight
+    into int() beats strptime's format-string state machine by roughly an
+    order of magnitude on these date-heavy payloads.
+    """
+    return int(
+        datetime(
+            int(value[6:10]),
+            int(value[0:2]),
+            int(value[3:5]),
+            int(value[11:13]),
+            int(value[14:16]),
+            int(value[17:19]),
+            tzinfo=_LOCAL_TZ,
+        ).timestamp()
+    )
+
+
+class RideEndpoint(NamedTuple):
     """Either the start or the end of a ride"""
 
     time: datetime
@@ -57,45 +132,132 @@ class RideEndpoint:
     long: float
 
 
-@dataclass
+# not frozen: the generated __init__ uses plain attribute stores instead of
+# one object.__setattr__ call per field, and rides are never hashed or mutated
+@dataclass(slots=True)
 class Ride:
     """A single bus ride"""
 
-    DATE_FORMAT = "%m/%d/%Y %H:%M:%S"
-
-    @classmethod
-    def from_dict(cls, value: dict) -> Ride:
-        """Convert a dict from the API to a Ride."""
-        embarkation = RideEndpoint(
-            time=datetime.strptime(
-                value["embarkationDate"], cls.DATE_FORMAT
-            ).astimezone(),
-            lat=value["embarkationLatitude"],
-            long=value["embarkationLongtitude"],
-        )
-        disembarkation = RideEndpoint(
-            time=datetime.strptime(
-                value["disembarkationDate"], cls.DATE_FORMAT
-            ).astimezone(),
-            lat=value["disembarkationLatitude"],
-            long=value["disembarkationLongtitude"],
-        )
-        return cls(
-            id=value["activityId"],
-            bus_id=value["busName"],
-            start=embarkation,
-            end=disembarkation,
-            driver=value["driverName"],
-            route_name=value["friendlyRouteDisplay"],
-            shift=value["shift"],
-            route_id=value["routeId"],
-        )
+    from_dict: ClassVar[Callable[[dict], Ride]]
+    from_list: ClassVar[Callable[[list[dict]], list[Ride]]]
 
+    # NOTE: field order is load-bearing - the deserializers and the
+    # coordinator's store hydration construct Rides positionally
     id: int
     bus_id: str
-    start: RideEndpoint
-    end: RideEndpoint
+    # the endpoints are stored flat (epoch seconds + coordinates) and only
+    # materialized into datetimes/RideEndpoints when actually read
+    start_ts: int
+    start_lat: float
+    start_long: float
+    end_ts: int
+    end_lat: float
+    end_long: float
     driver: str
     shift: str
     route_id: int
     route_name: str
+
+    @property
+    def start(self) -> RideEndpoint:
+        """The embarkation endpoint, built on demand."""
+        return RideEndpoint(
+            datetime.fromtimestamp(self.start_ts, tz=_LOCAL_TZ),
+            self.start_lat,
+            self.start_long,
+        )
+
+    @property
+    def end(self) -> RideEndpoint:
+        """The disembarkation endpoint, built on demand."""
+        return RideEndpoint(
+            datetime.fromtimestamp(self.end_ts, tz=_LOCAL_TZ),
+            self.end_lat,
+            self.end_long,
+        )
+
+
+# generated deserializer - payload keys listed in dataclass field order, with
+# the date parsing inlined into the generated body; the bus/driver/route/shift
+# strings repeat across most of a page, so duplicates are interned away
+Ride.from_dict = staticmethod(
+    _compile_from_dict(
+        Ride,
+        (
+            "v['activityId']",
+            "_intern(v['busName'])",
+            "_parse_ts(v['embarkationDate'])",
+            "v['embarkationLatitude']",
+            "_longitude(v, 'embarkation')",
+            "_parse_ts(v['disembarkationDate'])",
+            "v['disembarkationLatitude']",
+            "_longitude(v, 'disembarkation')",
+            "_intern(v['driverName'])",
+            "_intern(v['shift'])",
+            "v['routeId']",
+            "_intern(v['friendlyRouteDisplay'])",
+        ),
+        {"_parse_ts": _parse_ride_ts, "_intern": intern, "_longitude": _longitude},
+    )
+)
+
+
+# pulls the stable payload values in one C-level call instead of hashing the
+# key literals through bytecode per record; the two longitudes go through
+# _longitude instead to tolerate the upstream misspelling
+_RIDE_GET = itemgetter(
+    "activityId",
+    "busName",
+    "embarkationDate",
+    "embarkationLatitude",
+    "disembarkationDate",
+    "disembarkationLatitude",
+    "driverName",
+    "shift",
+    "routeId",
+    "friendlyRouteDisplay",
+)
+
+
+def _rides_from_list(values: list[dict]) -> list[Ride]:
+    """
+    Convert a whole page of API dicts to Rides in one pass.
+
+    Each record's values are extracted with a single itemgetter call, the
+    timestamp columns are pushed through the parser via a single map(), and
+    the rest feeds one straight-line constructor call per record.
+    """
+    rows = [_RIDE_GET(v) for v in values]
+    embark_times = map(_parse_ride_ts, [row[2] for row in rows])
+    disembark_times = map(_parse_ride_ts, [row[4] for row in rows])
+    return [
+        Ride(
+            aid,
+            intern(bus),
+            et,
+            elat,
+            _longitude(v, "embarkation"),
+            dt,
+            dlat,
+            _longitude(v, "disembarkation"),
+            intern(driver),
+            intern(shift),
+            rid,
+            intern(route),
+        )
+        for v, (
+            aid,
+            bus,
+            _ed,
+            elat,
+            _dd,
+            dlat,
+            driver,
+            shift,
+            rid,
+            route,
+        ), et, dt in zip(values, rows, embark_times, disembark_times, strict=True)
+    ]
+
+
+Ride.from_list = staticmethod(_rides_from_list)